@@ -12,43 +12,261 @@ import mss
 import numpy as np
 import pyautogui
 import time
+import atexit
+import math
+import operator
 import os
+import shutil
 import sys
+import tempfile
 import logging
+import logging.handlers
+import platform
 import yaml
 import threading
+import queue
+from collections import deque
+from functools import lru_cache, reduce
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from ultralytics import YOLO
-
-# 配置日誌
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('auto_system.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+
+# 優先使用 libyaml 的 C 版載入器
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    from numba import njit
+except ImportError:  # numba 未安裝時以純 NumPy 執行
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+_LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging(log_path: str = 'auto_system.log'):
+    """配置日誌 (由程式進入點呼叫，匯入本模組不會開檔或啟動執行緒)
+    
+    主控台輸出維持同步，才不會排在之後的選單與 input() 提示後面；
+    檔案寫入只把紀錄放入佇列，由 QueueListener 背景執行緒格式化並寫出
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    formatter = logging.Formatter(_LOG_FORMAT)
+    file_handler = logging.FileHandler(log_path, encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # 只合併參數，前綴由輸出端加上
+    logging.basicConfig(level=logging.INFO, handlers=[console_handler, queue_handler])
+    
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)  # 先於 logging.shutdown 執行，確保佇列內的紀錄都已寫出
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Python 3.10+ 才支援 slots=True，舊版退回一般 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Detection:
     """偵測結果數據類"""
-    bbox: List[int]
+    bbox: Tuple[int, int, int, int]
     confidence: float
     class_id: int
     class_name: str
     center: Tuple[int, int]
-    distance_from_center: float = 0.0
+    distance_sq: float = 0.0
+    label: str = ''
+    
+    @property
+    def distance_from_center(self) -> float:
+        """距離畫面中心的距離 (僅供顯示，排序與比較使用 distance_sq)"""
+        return math.sqrt(self.distance_sq)
+
+@lru_cache(maxsize=1024)
+def _format_label(class_name: str, confidence_pct: int) -> str:
+    """格式化預覽標籤；信賴度取到百分位，同類別同分數的標籤跨幀重複使用"""
+    return f"{class_name}: {confidence_pct / 100:.2f}"
+
+class DetectionBatch:
+    """偵測結果的陣列結構 (SoA)，依排序後順序存放，只在需要時才建立個別的 Detection 物件"""
+    
+    __slots__ = ('bboxes', 'confidences', 'class_ids', 'centers', 'distances_sq',
+                 'class_names', 'mob_detected', '_labels', '_records')
+    
+    def __init__(self, bboxes: np.ndarray, confidences: np.ndarray, class_ids: np.ndarray,
+                 centers: np.ndarray, distances_sq: np.ndarray, names: Dict[int, str],
+                 mob_detected: bool = False):
+        self.bboxes = bboxes              # (N, 4) int32
+        self.confidences = confidences    # (N,) float32
+        self.class_ids = class_ids        # (N,) int32
+        self.centers = centers            # (N, 2) int32
+        self.distances_sq = distances_sq  # (N,) float64
+        self.class_names = [names[c] for c in class_ids.tolist()]
+        self.mob_detected = mob_detected  # 依過濾後 (取前 K 個之前) 的全部結果判斷
+        self._labels = None
+        self._records = [None] * len(self.class_names)
+    
+    @classmethod
+    def empty(cls) -> 'DetectionBatch':
+        """沒有任何偵測結果的批次"""
+        return cls(np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32),
+                   np.empty(0, dtype=np.int32), np.empty((0, 2), dtype=np.int32),
+                   np.empty(0, dtype=np.float64), {})
+    
+    @classmethod
+    def from_detections(cls, detections: List[Detection]) -> 'DetectionBatch':
+        """由已排序的 Detection 物件 (例如追蹤結果) 建立批次，沿用原本的物件"""
+        if not detections:
+            return cls.empty()
+        
+        batch = cls.__new__(cls)
+        batch.bboxes = np.array([d.bbox for d in detections], dtype=np.int32)
+        batch.confidences = np.array([d.confidence for d in detections], dtype=np.float32)
+        batch.class_ids = np.array([d.class_id for d in detections], dtype=np.int32)
+        batch.centers = np.array([d.center for d in detections], dtype=np.int32)
+        batch.distances_sq = np.array([d.distance_sq for d in detections], dtype=np.float64)
+        batch.class_names = [d.class_name for d in detections]
+        batch.mob_detected = 'mob' in batch.class_names
+        batch._labels = [d.label for d in detections]
+        batch._records = list(detections)
+        return batch
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __getitem__(self, i: int) -> Detection:
+        record = self._records[i]
+        if record is None:
+            record = Detection(
+                bbox=tuple(self.bboxes[i].tolist()),
+                confidence=float(self.confidences[i]),
+                class_id=int(self.class_ids[i]),
+                class_name=self.class_names[i],
+                center=tuple(self.centers[i].tolist()),
+                distance_sq=float(self.distances_sq[i]),
+                label=self.labels[i]
+            )
+            self._records[i] = record
+        return record
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+    
+    @property
+    def labels(self) -> List[str]:
+        """預覽用標籤字串，第一次使用時才一次格式化"""
+        if self._labels is None:
+            confidence_pcts = np.rint(self.confidences * 100).astype(np.int32).tolist()
+            self._labels = [_format_label(name, pct)
+                            for name, pct in zip(self.class_names, confidence_pcts)]
+        return self._labels
+
+@njit(cache=True, fastmath=True)
+def _rank_detections(xyxy, cls, priority_lut, center_x, center_y):
+    """計算偵測框中心與距離平方，並回傳依 (優先級, 距離) 排序的索引"""
+    centers_x = ((xyxy[:, 0] + xyxy[:, 2]) / 2).astype(np.int64)
+    centers_y = ((xyxy[:, 1] + xyxy[:, 3]) / 2).astype(np.int64)
+    dx = (centers_x - center_x).astype(np.float64)
+    dy = (centers_y - center_y).astype(np.float64)
+    distances_sq = dx * dx + dy * dy
+    keys = priority_lut[cls] * 1e12 + distances_sq
+    order = np.argsort(keys, kind='mergesort')
+    return order, centers_x, centers_y, distances_sq
+
+def _warmup_jit():
+    """預先編譯 JIT 函式，避免第一次偵測時才付出編譯時間"""
+    xyxy = np.array([[0, 0, 10, 10], [1, 1, 11, 11]], dtype=np.float32)
+    cls = np.zeros(2, dtype=np.int32)
+    _rank_detections(xyxy, cls, np.zeros(1, dtype=np.int32), 0, 0)
+
+def _create_tracker():
+    """建立 OpenCV 單目標追蹤器 (只使用 opencv-contrib-python 的 CSRT/KCF)
+    
+    一般 opencv-python 只有 MIL，每次更新比 GPU 全畫面偵測還慢，因此不使用
+    """
+    legacy = getattr(cv2, 'legacy', None)
+    candidates = (
+        (cv2, 'TrackerCSRT_create'),
+        (legacy, 'TrackerCSRT_create'),
+        (cv2, 'TrackerKCF_create'),
+        (legacy, 'TrackerKCF_create'),
+    )
+    for module, name in candidates:
+        factory = getattr(module, name, None)
+        if factory is not None:
+            return factory()
+    return None
+
+# 非阻塞按鍵輪詢：OpenCV 4.5+ 的 pollKey 不會固定等待 1ms；macOS 仍以 waitKey 驅動 Cocoa 事件
+if hasattr(cv2, 'pollKey') and sys.platform != 'darwin':
+    _poll_key = cv2.pollKey
+else:
+    def _poll_key() -> int:
+        return cv2.waitKey(1)
+
+# 位元計數：Python 3.10+ 使用 int.bit_count (硬體 POPCNT)
+_popcount = int.bit_count if hasattr(int, 'bit_count') else (lambda value: bin(value).count('1'))
+
+# 隨機搜尋可選的移動方式
+_SEARCH_MOVEMENTS = ('left', 'right', 'jump')
+
+# 僅記錄模式下會輸出日誌的類別
+_LOG_ONLY_LABELS = {'mob': '怪物', 'item': '物品', 'npc': ' NPC'}
+
+# 可選用的模型檔案副檔名
+MODEL_EXTENSIONS = ('.pt', '.onnx')
+
+# 預覽繪製顏色 (BGR)
+_CLASS_COLORS = {
+    'mob': (0, 0, 255),      # 紅色
+    'item': (0, 255, 0),     # 綠色
+    'npc': (255, 0, 0),      # 藍色
+    'character': (255, 255, 0), # 青色
+    'environment': (128, 128, 128), # 灰色
+    'ui': (255, 0, 255)      # 洋紅色
+}
+_DEFAULT_CLASS_COLOR = (255, 255, 255)
+
+# 自動化預覽視窗標題
+PREVIEW_WINDOW_NAME = 'MapleStory Auto Bot - 按 q 暫停/恢復'
+
+# macOS 的 HighGUI (Cocoa) 視窗只能在主執行緒操作，預覽改在主迴圈內繪製
+_PREVIEW_ON_MAIN_THREAD = sys.platform == 'darwin'
+
+# 截止時間前改用忙等待的時間長度 (秒)
+_SPIN_THRESHOLD = 0.002
+
+# 擷取緩衝區數量: 擷取執行緒寫入、佇列等待、主迴圈處理各佔一個
+_FRAME_POOL_SIZE = 3
+
+# 視窗設定選單的預設擷取區域
+_MONITOR_PRESETS = {
+    '1': {'left': 0, 'top': 100, 'width': 1920, 'height': 980},   # Full HD
+    '2': {'left': 320, 'top': 180, 'width': 1280, 'height': 720},  # QHD
+}
+
+@lru_cache(maxsize=256)
+def _split_key_path(key_path: str) -> Tuple[str, ...]:
+    """拆解點分割的配置路徑 (同一路徑只拆解一次)"""
+    return tuple(key_path.split('.'))
 
 class ConfigManager:
     """配置管理器"""
     
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
+        self._config_mtime = None
         self.config = self.load_config()
     
     def load_config(self) -> Dict:
@@ -56,7 +274,9 @@ class ConfigManager:
         try:
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f)
+                    config = yaml.load(f, Loader=YamlLoader)
+                self._config_mtime = os.path.getmtime(self.config_path)
+                return config
             else:
                 logger.warning(f"配置文件 {self.config_path} 不存在，使用默認配置")
                 return self._get_default_config()
@@ -64,13 +284,30 @@ class ConfigManager:
             logger.error(f"載入配置失敗: {e}")
             return self._get_default_config()
     
+    def reload_if_changed(self) -> bool:
+        """配置文件修改時間改變時才重新載入，回傳是否已重新載入"""
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            return False
+        
+        if mtime == self._config_mtime:
+            return False
+        
+        self.config = self.load_config()
+        return True
+    
     def _get_default_config(self) -> Dict:
         """獲取默認配置"""
         return {
             'model': {
                 'default_path': 'weights/best.pt',
                 'confidence_threshold': 0.6,
-                'iou_threshold': 0.45
+                'iou_threshold': 0.45,
+                'precision': 'fp32',
+                'imgsz': 640,
+                'device': 'auto',
+                'cpu_threads': 0
             },
             'window': {
                 'default': {'left': 100, 'top': 100, 'width': 1200, 'height': 800}
@@ -95,11 +332,7 @@ class ConfigManager:
     def get(self, key_path: str, default=None):
         """獲取配置值，支持點分割路徑如 'model.confidence_threshold'"""
         try:
-            keys = key_path.split('.')
-            value = self.config
-            for key in keys:
-                value = value[key]
-            return value
+            return reduce(operator.getitem, _split_key_path(key_path), self.config)
         except (KeyError, TypeError):
             return default
 
@@ -108,14 +341,15 @@ class PerformanceMonitor:
     
     def __init__(self):
         self.fps_counter = 0
-        self.last_fps_time = time.time()
+        self.last_fps_time = time.perf_counter()
         self.current_fps = 0
-        self.detection_times = []
+        self.detection_times = deque(maxlen=100)  # 只保留最近100次
+        self._detection_time_sum = 0.0
         
     def update_fps(self):
         """更新 FPS 計數"""
         self.fps_counter += 1
-        current_time = time.time()
+        current_time = time.perf_counter()
         if current_time - self.last_fps_time >= 1.0:
             self.current_fps = self.fps_counter
             self.fps_counter = 0
@@ -123,19 +357,169 @@ class PerformanceMonitor:
     
     def record_detection_time(self, detection_time: float):
         """記錄偵測時間"""
+        if len(self.detection_times) == self.detection_times.maxlen:
+            self._detection_time_sum -= self.detection_times[0]
         self.detection_times.append(detection_time)
-        if len(self.detection_times) > 100:  # 只保留最近100次
-            self.detection_times.pop(0)
+        self._detection_time_sum += detection_time
     
     def get_avg_detection_time(self) -> float:
         """獲取平均偵測時間"""
-        return sum(self.detection_times) / len(self.detection_times) if self.detection_times else 0
+        return self._detection_time_sum / len(self.detection_times) if self.detection_times else 0
+
+def _sleep_until(deadline: float):
+    """睡眠到指定的 perf_counter 時間點：先粗略睡眠，最後一小段以讓出 CPU 的忙等待補足精度"""
+    remaining = deadline - time.perf_counter()
+    if remaining > _SPIN_THRESHOLD:
+        time.sleep(remaining - _SPIN_THRESHOLD)
+    while time.perf_counter() < deadline:
+        time.sleep(0)
+
+def _set_timer_resolution(enable: bool):
+    """Windows 上將系統計時器解析度設為 1ms (預設約 15ms)，讓 time.sleep 更精準"""
+    if platform.system() != 'Windows':
+        return
+    try:
+        import ctypes
+        winmm = ctypes.windll.winmm
+        if enable:
+            winmm.timeBeginPeriod(1)
+        else:
+            winmm.timeEndPeriod(1)
+    except Exception as e:
+        logger.debug(f"調整計時器解析度失敗: {e}")
+
+class DeadlineScheduler:
+    """以絕對截止時間控制固定週期，避免 sleep 誤差累積造成 FPS 抖動"""
+    
+    def __init__(self, period: float):
+        self.period = period
+        self.reset()
+    
+    def reset(self):
+        """從現在重新起算週期 (暫停恢復後呼叫，避免連續補跑)"""
+        self._next_deadline = time.perf_counter() + self.period
+    
+    def wait(self):
+        """等待到下一個截止時間"""
+        _sleep_until(self._next_deadline)
+        self._next_deadline += self.period
+        
+        # 落後超過一個週期時不追趕
+        now = time.perf_counter()
+        if self._next_deadline < now:
+            self._next_deadline = now + self.period
+
+class ScreenCapturer:
+    """螢幕擷取器：Windows 優先使用 dxcam (DXGI Desktop Duplication)，其他平台使用 mss"""
+    
+    def __init__(self, backend: str = 'auto', target_fps: int = 10):
+        self.target_fps = target_fps
+        # mss 不是執行緒安全的，每個執行緒各自持有一個實例
+        self._local = threading.local()
+        self._sct_instances = []
+        self._camera = None
+        self._region = None
+        self.backend = self._init_backend(backend)
+    
+    def _init_backend(self, backend: str) -> str:
+        """選擇擷取後端，dxcam 無法使用時退回 mss"""
+        if backend in ('auto', 'dxcam') and platform.system() == 'Windows':
+            try:
+                import dxcam
+                self._camera = dxcam.create(output_idx=0, output_color='BGR')
+                if self._camera is not None:
+                    logger.info("🖥️ 使用 dxcam (DXGI) 擷取畫面")
+                    return 'dxcam'
+            except Exception as e:
+                logger.warning(f"dxcam 無法使用，改用 mss: {e}")
+        return 'mss'
+    
+    def grab(self, monitor: Dict, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """擷取指定區域，回傳 BGR 影像
+        
+        若提供尺寸相符的 out 緩衝區，畫面會寫入 out 並回傳 out (連續記憶體)；
+        否則回傳非連續視圖，只保證在下次擷取前有效。
+        """
+        if self.backend == 'dxcam':
+            frame = self._grab_dxcam(monitor)
+            if frame is not None and out is not None and out.shape == frame.shape:
+                np.copyto(out, frame)
+                return out
+            return frame
+        
+        screenshot = self._get_sct().grab(monitor)
+        bgra = np.frombuffer(screenshot.raw, dtype=np.uint8)
+        bgra = bgra.reshape(screenshot.height, screenshot.width, 4)
+        if out is not None and out.shape == (screenshot.height, screenshot.width, 3):
+            # cvtColor 直接寫入預先配置的緩衝區，不另行配置記憶體
+            cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+            return out
+        # 直接以 BGRA 原始緩衝區建立視圖並切掉 alpha，省去 cvtColor 的整幀複製
+        return bgra[..., :3]
+    
+    def _grab_dxcam(self, monitor: Dict) -> Optional[np.ndarray]:
+        """從 dxcam 的背景擷取串流取得最新一幀，區域改變時重新啟動串流"""
+        left, top = monitor['left'], monitor['top']
+        region = (left, top, left + monitor['width'], top + monitor['height'])
+        if region != self._region:
+            if self._camera.is_capturing:
+                self._camera.stop()
+            # video_mode 讓畫面靜止時也持續輸出最後一幀
+            self._camera.start(target_fps=self.target_fps, region=region, video_mode=True)
+            self._region = region
+        return self._camera.get_latest_frame()
+    
+    def _get_sct(self):
+        """取得目前執行緒的 mss 實例，避免每幀重新開啟顯示裝置"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            self._sct_instances.append(sct)
+        return sct
+    
+    def close_thread(self):
+        """釋放目前執行緒持有的 mss 實例"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            return
+        self._local.sct = None
+        if sct in self._sct_instances:
+            self._sct_instances.remove(sct)
+        sct.close()
+    
+    def close(self):
+        """釋放所有擷取資源"""
+        for sct in self._sct_instances:
+            try:
+                sct.close()
+            except Exception:
+                pass
+        self._sct_instances.clear()
+        self._local = threading.local()
+        
+        if self._camera is not None:
+            try:
+                if self._camera.is_capturing:
+                    self._camera.stop()
+                self._camera.release()
+            except Exception:
+                pass
+            self._camera = None
+            self._region = None
+            self.backend = 'mss'
 
 class OptimizedMapleBot:
     """優化版 MapleStory 自動化機器人"""
     
-    def __init__(self, config_path: str = "config.yaml"):
-        self.config = ConfigManager(config_path)
+    def __init__(self, config_path: str = "config.yaml", config_manager: Optional[ConfigManager] = None,
+                 model_path: Optional[str] = None):
+        # 可直接沿用呼叫端已載入的配置，避免重複讀取 YAML
+        self.config = config_manager if config_manager is not None else ConfigManager(config_path)
+        # 執行期覆寫 (指定的模型、選單調整的視窗) 不寫回配置文件，重新載入配置後再套用一次
+        self._model_path_override = model_path
+        self._monitor_override = None
+        self._apply_runtime_overrides()
         self.model = None
         self.running = False
         self.paused = False
@@ -143,11 +527,9 @@ class OptimizedMapleBot:
         self.performance_monitor = PerformanceMonitor()
         
         # 從配置載入設定
-        self.monitor = self.config.get('window.default')
-        self.confidence_threshold = self.config.get('model.confidence_threshold', 0.6)
-        self.action_delay = self.config.get('automation.action_delay', 0.3)
-        self.scan_interval = self.config.get('automation.scan_interval', 0.1)
-        self.max_runtime = self.config.get('safety.max_runtime_hours', 2) * 3600
+        self._apply_config_settings()
+        self.device, self.half = self._resolve_device()
+        self._build_infer_kwargs()
         
         # 統計數據
         self.stats = {
@@ -161,33 +543,175 @@ class OptimizedMapleBot:
         }
         
         # 尋找怪物相關變數
-        self.last_mob_detection_time = time.time()
+        self.last_mob_detection_time = time.perf_counter()
         self.is_searching = False
         self.search_start_time = 0
         self.original_position = None
         self.search_direction = 1  # 1 for right, -1 for left
         self.search_moves = 0
+        self._rng = np.random.default_rng()
+        
+        # 非阻塞的動作節奏：以截止時間取代 sleep，冷卻期間偵測持續進行
+        self._next_action_at = 0.0
+        self._next_search_move_at = 0.0
+        self._held_key = None
+        self._key_release_at = 0.0
+        
+        # 畫面變化偵測
+        self._last_frame_hash = None
+        self._last_detect_time = 0
+        self._last_detections = DetectionBatch.empty()
+        
+        # 目標追蹤 [(detection, tracker)]
+        self._tracks = []
+        self._frames_since_full_detect = 0
+        
+        # 螢幕擷取
+        self._capturer = ScreenCapturer(
+            self.config.get('automation.capture_backend', 'auto'),
+            target_fps=max(1, int(1 / max(self.scan_interval, 0.001)))
+        )
+        self._frame_pool = []
+        self._preview_buf = None
+        self._resize_buf = None
+        self._class_colors = []
+        self._fps_text_value = None
+        self._fps_text = ""
         
         # 設定 PyAutoGUI
         if self.config.get('safety.enable_failsafe', True):
             pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.05  # 減少暫停時間提升性能
+        pyautogui.PAUSE = 0  # 不在每個呼叫後自動暫停，改由各動作自行控制間隔
         
         logger.info("OptimizedMapleBot 初始化完成")
         self._load_model()
     
+    def _apply_runtime_overrides(self):
+        """將指定的模型路徑寫入記憶體中的配置 (配置重新載入後需再次呼叫)"""
+        if self._model_path_override:
+            self.config.config.setdefault('model', {})['default_path'] = self._model_path_override
+    
+    def _apply_config_settings(self):
+        """從配置載入設定，並預先計算熱路徑上使用的查找表"""
+        # 擷取區域保持為獨立的純 dict，避免與配置共用同一物件；選單調整過的視窗優先
+        if self._monitor_override is not None:
+            self._set_capture_region(dict(self._monitor_override))
+        else:
+            window = self.config.get('window.default', {}) or {}
+            self._set_capture_region({
+                'left': int(window.get('left', 100)),
+                'top': int(window.get('top', 100)),
+                'width': int(window.get('width', 1200)),
+                'height': int(window.get('height', 800))
+            })
+        self.confidence_threshold = self.config.get('model.confidence_threshold', 0.6)
+        self.imgsz = self.config.get('model.imgsz', 640)
+        self.iou_threshold = self.config.get('model.iou_threshold', 0.45)
+        self.action_delay = self.config.get('automation.action_delay', 0.3)
+        self.scan_interval = self.config.get('automation.scan_interval', 0.1)
+        self.max_runtime = self.config.get('safety.max_runtime_hours', 2) * 3600
+        
+        # 目標優先級 (數字越小越優先)
+        self._priority_map = {
+            name: i for i, name in enumerate(self.config.get('automation.priority_targets', []))
+        }
+        self._build_priority_lut()
+        self._max_detections = self.config.get('automation.max_detections', 20)
+        
+        # 各類別行為表: {class_name: (action, max_distance_sq, delay)}
+        default_max_distance = self.config.get('automation.max_detection_distance', 200)
+        behaviors = self.config.get('detection_behavior', {}) or {}
+        self._default_behavior = ('ignore', default_max_distance ** 2, 0.5)
+        self._behavior = {
+            name: (
+                cfg.get('action', 'attack' if name == 'mob' else 'ignore'),
+                cfg.get('max_distance', default_max_distance) ** 2,
+                cfg.get('attack_delay', cfg.get('interaction_delay', 0.5))
+            )
+            for name, cfg in {'mob': {}, **behaviors}.items()
+        }
+        
+        self._controls = {
+            'attack_method': self.config.get('controls.attack_method', 'click'),
+            'attack_key': self.config.get('controls.attack_key', 'z'),
+            'pickup_key': self.config.get('controls.pickup_key', 'z'),
+            'interact_key': self.config.get('controls.interact_key', 'space')
+        }
+        self._pyautogui_pause = self.config.get('safety.pyautogui_pause', 0.05)
+        self._action_dispatch = {
+            'attack': self._do_attack,
+            'pickup': self._do_pickup,
+            'interact': self._do_interact
+        }
+        self._mob_hunting_enabled = self.config.get('automation.mob_hunting.enable', True)
+        self._search_delay = self.config.get('automation.mob_hunting.search_delay', 2.0)
+        self._max_search_time = self.config.get('automation.mob_hunting.max_search_time', 10)
+        self._search_pattern = self.config.get('automation.mob_hunting.search_pattern', 'horizontal')
+        self._move_distance = self.config.get('automation.mob_hunting.move_distance', 100)
+        self._return_to_center_enabled = self.config.get('automation.mob_hunting.return_to_center', True)
+        self._move_keys = {
+            name: self.config.get(f'controls.movement_keys.{name}', default)
+            for name, default in (('left', 'left'), ('right', 'right'), ('jump', 'x'), ('down', 'down'))
+        }
+        
+        # 畫面未變化時略過偵測
+        self._frame_skip_enabled = self.config.get('automation.frame_skip.enable', True)
+        self._hash_threshold = self.config.get('automation.frame_skip.hash_threshold', 4)
+        self._max_skip_seconds = self.config.get('automation.frame_skip.max_skip_seconds', 1.0)
+        
+        # 追蹤已攻擊目標，減少全畫面偵測
+        self._tracking_enabled = self.config.get('automation.tracking.enable', False)
+        self._full_detect_interval = self.config.get('automation.tracking.full_detect_interval', 5)
+    
+    def set_monitor(self, monitor: Dict[str, int]):
+        """設定擷取區域並記為執行期覆寫，配置重新載入後仍保留"""
+        self._monitor_override = dict(monitor)
+        self._set_capture_region(monitor)
+    
+    def _set_capture_region(self, monitor: Dict[str, int]):
+        """設定擷取區域，並同步更新畫面中心點 (角色位置)"""
+        self.monitor = monitor
+        self._center = (monitor['width'] // 2, monitor['height'] // 2)
+    
+    def _build_priority_lut(self):
+        """建立 class_id → 優先級 的查找陣列 (未列入優先目標者為 999)"""
+        names = self.model.names if self.model is not None else {}
+        lut = np.full(max(names, default=-1) + 1, 999, dtype=np.int32)
+        for class_id, name in names.items():
+            lut[class_id] = self._priority_map.get(name, 999)
+        self._priority_lut = lut
+        self._mob_class_id = next((i for i, name in names.items() if name == 'mob'), -1)
+    
+    def _build_class_colors(self):
+        """建立 class_id → 繪製顏色 的查找表，繪圖時以索引取代字串查詢"""
+        names = self.model.names if self.model is not None else {}
+        colors = [_DEFAULT_CLASS_COLOR] * (max(names, default=-1) + 1)
+        for class_id, name in names.items():
+            colors[class_id] = _CLASS_COLORS.get(name, _DEFAULT_CLASS_COLOR)
+        self._class_colors = colors
+    
     def _load_model(self):
         """載入 YOLO 模型"""
         model_path = self.config.get('model.default_path')
-        if not model_path or not os.path.exists(model_path):
+        if not model_path or not os.path.isfile(model_path):
             logger.error(f"模型文件不存在: {model_path}")
             return False
         
         try:
+            # ultralytics 會連帶載入 torch，延後到實際載入模型時才匯入
+            from ultralytics import YOLO
+            
+            model_path = self._resolve_engine_path(model_path)
             logger.info(f"載入模型: {model_path}")
-            self.model = YOLO(model_path)
-            self.model.conf = self.confidence_threshold
-            self.model.iou = self.config.get('model.iou_threshold', 0.45)
+            if model_path.endswith(('.engine', '.onnx')):
+                # 匯出格式無法自動推斷任務類型；.onnx 由 ultralytics 以 ONNX Runtime 執行
+                self.model = YOLO(model_path, task='detect')
+            else:
+                self.model = YOLO(model_path)
+            self._build_priority_lut()
+            self._build_class_colors()
+            _warmup_jit()
+            self._warmup_model()
             
             logger.info("✅ 模型載入成功!")
             logger.info(f"📊 模型類別: {self.model.names}")
@@ -197,121 +721,301 @@ class OptimizedMapleBot:
             logger.error(f"模型載入失敗: {e}")
             return False
     
-    def capture_screen(self) -> Optional[np.ndarray]:
-        """優化的螢幕擷取"""
+    def _warmup_model(self, iterations: int = 3):
+        """以實際輸入尺寸預熱模型，讓 cuDNN 在自動化開始前完成演算法選擇 (CPU 只需預熱一次)"""
+        if not self.half:
+            iterations = 1
+        
+        height, width = self.monitor['height'], self.monitor['width']
+        scale = max(1.0, max(height, width) / self.imgsz)
+        dummy = np.zeros((round(height / scale), round(width / scale), 3), dtype=np.uint8)
+        for _ in range(iterations):
+            self.model(dummy, **self._infer_kwargs)
+    
+    def _build_infer_kwargs(self):
+        """組合每次推論共用的參數 (裝置、精度、輸入尺寸與門檻)，設定變更後需重新呼叫"""
+        self._infer_kwargs = {
+            'imgsz': self.imgsz,
+            'conf': self.confidence_threshold,
+            'iou': self.iou_threshold,
+            'half': self.half,
+            'device': self.device,
+            'verbose': False,
+        }
+    
+    def _resolve_device(self) -> Tuple[str, bool]:
+        """依 model.device 決定推論裝置，CUDA 上啟用 FP16 推論"""
+        device = str(self.config.get('model.device', 'auto'))
+        try:
+            import torch
+            cuda_available = torch.cuda.is_available()
+        except ImportError:
+            torch = None
+            cuda_available = False
+        
+        if device == 'auto':
+            device = 'cuda' if cuda_available else 'cpu'
+        
+        half = cuda_available and device.startswith('cuda')
+        if half:
+            # 非 FP16 的矩陣運算也允許使用 TF32；輸入尺寸固定，讓 cuDNN 自動挑選最快的卷積演算法
+            torch.set_float32_matmul_precision('high')
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.benchmark = True
+            logger.info(f"🖥️ 推論裝置: {device} (FP16)")
+        elif torch is not None:
+            # CPU 推論預設只用一半的核心，保留給擷取與預覽執行緒
+            threads = self.config.get('model.cpu_threads', 0) or max(1, (os.cpu_count() or 2) // 2)
+            torch.set_num_threads(threads)
+            torch.backends.mkldnn.enabled = True
+            logger.info(f"🖥️ 推論裝置: {device} ({threads} 執行緒)")
+        return device, half
+    
+    def _resolve_engine_path(self, model_path: str) -> str:
+        """依 model.precision 取得 TensorRT 引擎路徑，必要時先匯出"""
+        precision = self.config.get('model.precision', 'fp32')
+        if precision not in ('fp16', 'int8') or not model_path.endswith('.pt'):
+            return model_path
+        
+        # INT8 需要校準資料集 (遊戲截圖的 YOLO data yaml)，缺少時改用 FP16 引擎
+        calib_yaml = self.config.get('model.calib_yaml')
+        if precision == 'int8' and not (calib_yaml and os.path.isfile(calib_yaml)):
+            logger.warning(f"INT8 校準資料集不存在: {calib_yaml!r}，改用 FP16 引擎")
+            precision = 'fp16'
+        
+        # 引擎檔名包含精度與輸入尺寸，避免設定變更後誤用舊引擎；.pt 較新時重新匯出
+        source = Path(model_path)
+        engine_path = source.with_name(f"{source.stem}.{precision}-{self.imgsz}.engine")
+        if engine_path.exists() and engine_path.stat().st_mtime >= source.stat().st_mtime:
+            return str(engine_path)
+        
         try:
-            with mss.mss() as sct:
-                screenshot = sct.grab(self.monitor)
-                img = np.array(screenshot)
-                img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-                return img
+            if not self.half:
+                logger.warning("未偵測到 CUDA 裝置，略過 TensorRT 匯出")
+                return model_path
+            
+            export_args = {
+                'format': 'engine',
+                'half': precision == 'fp16',
+                'int8': precision == 'int8',
+                'imgsz': self.imgsz,
+                'device': self.device,
+                'workspace': 4
+            }
+            if precision == 'int8':
+                export_args['data'] = calib_yaml
+            
+            from ultralytics import YOLO
+            
+            logger.info(f"🔧 匯出 TensorRT 引擎 ({precision})，首次執行需要數分鐘...")
+            # 匯出會先在 .pt 旁產生中間的 .onnx，改從暫存目錄的副本匯出，避免覆寫 weights/ 內的同名模型
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_model = shutil.copy2(model_path, tmp_dir)
+                exported = YOLO(tmp_model).export(**export_args)
+                shutil.move(exported, engine_path)
+            return str(engine_path)
+        
+        except Exception as e:
+            logger.warning(f"TensorRT 匯出失敗，改用原始模型: {e}")
+            return model_path
+    
+    def capture_screen(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """優化的螢幕擷取
+        
+        若提供尺寸相符的 out 緩衝區，畫面會複製進去並回傳 out (連續記憶體)，
+        否則回傳原始緩衝區的 BGR 視圖。
+        注意: 擷取期間不可替換 self.monitor，調整視窗設定需在自動化停止時進行
+        """
+        try:
+            return self._capturer.grab(self.monitor, out=out)
         except Exception as e:
             logger.error(f"螢幕擷取失敗: {e}")
             return None
     
-    def detect_objects(self, img: np.ndarray) -> List[Detection]:
+    def close(self):
+        """放開仍按住的按鍵並釋放螢幕擷取資源"""
+        if getattr(self, '_held_key', None) is not None:
+            self._release_held_key()
+        capturer = getattr(self, '_capturer', None)
+        if capturer is not None:
+            capturer.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def detect_objects(self, img: np.ndarray) -> DetectionBatch:
         """優化的物件偵測"""
         if self.model is None:
-            return []
+            return DetectionBatch.empty()
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            results = self.model(img, verbose=False)
-            detections = []
+            # 先以 INTER_AREA 等比縮小到模型輸入尺寸，座標稍後再放大回原解析度
+            scale = 1.0
+            height, width = img.shape[:2]
+            if max(height, width) > self.imgsz:
+                scale = max(height, width) / self.imgsz
+                size = (round(width / scale), round(height / scale))
+                # 縮放結果寫入預先配置的緩衝區，避免每幀重新配置
+                if self._resize_buf is None or self._resize_buf.shape[1::-1] != size:
+                    self._resize_buf = np.empty((size[1], size[0], 3), dtype=np.uint8)
+                img = cv2.resize(img, size, dst=self._resize_buf, interpolation=cv2.INTER_AREA)
             
+            results = self.model(img, **self._infer_kwargs)
             # 計算畫面中心點
-            center_x, center_y = self.monitor['width'] // 2, self.monitor['height'] // 2
-            
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        xyxy = box.xyxy[0].cpu().numpy()
-                        conf = box.conf[0].cpu().numpy()
-                        cls = box.cls[0].cpu().numpy()
-                        
-                        if conf > self.confidence_threshold:
-                            detection_center = (int((xyxy[0] + xyxy[2]) / 2), int((xyxy[1] + xyxy[3]) / 2))
-                            
-                            # 計算距離中心點的距離
-                            distance = np.sqrt((detection_center[0] - center_x)**2 + (detection_center[1] - center_y)**2)
-                            
-                            detection = Detection(
-                                bbox=[int(x) for x in xyxy],
-                                confidence=float(conf),
-                                class_id=int(cls),
-                                class_name=self.model.names[int(cls)],
-                                center=detection_center,
-                                distance_from_center=distance
-                            )
-                            detections.append(detection)
+            center_x, center_y = self._center
             
-            # 按優先級和距離排序
-            detections = self._prioritize_detections(detections)
+            # 每個結果只做一次 GPU→CPU 傳輸，之後全部以陣列運算
+            boxes_list = [r.boxes for r in results if r.boxes is not None and len(r.boxes) > 0]
+            if not boxes_list:
+                detections = DetectionBatch.empty()
+            else:
+                # boxes.data 為 [x1, y1, x2, y2, (id,) conf, cls]，一次傳輸取回全部欄位
+                data = np.concatenate([b.data.cpu().numpy() for b in boxes_list])
+                xyxy = data[:, :4] * scale
+                conf = data[:, -2]
+                cls = data[:, -1].astype(np.int32)
+                
+                # 信心度門檻與 NMS 已由 ultralytics 推論時套用 (conf、iou 參數)
+                xyxy = np.ascontiguousarray(xyxy, dtype=np.float32)
+                conf = conf.astype(np.float32)
+                
+                # 中心點、距離與優先級排序在編譯後的函式中一次完成
+                order, centers_x, centers_y, distances_sq = _rank_detections(
+                    xyxy, cls, self._priority_lut, center_x, center_y)
+                
+                # 只保留排序後的前 K 個結果，以陣列切片取出
+                top = order[:self._max_detections]
+                # 縮放還原後的座標可能略超出畫面，一次裁切到 [0, W-1] × [0, H-1]
+                bboxes = xyxy[top].astype(np.int32)
+                np.clip(bboxes, 0, np.array([width - 1, height - 1, width - 1, height - 1],
+                                            dtype=np.int32), out=bboxes)
+                detections = DetectionBatch(
+                    bboxes=bboxes,
+                    confidences=conf[top],
+                    class_ids=cls[top],
+                    centers=np.stack((centers_x[top], centers_y[top]), axis=1).astype(np.int32),
+                    distances_sq=distances_sq[top],
+                    names=self.model.names,
+                    mob_detected=bool((cls == self._mob_class_id).any())
+                )
             
             # 記錄統計
             self.stats['detections'] += len(detections)
-            detection_time = time.time() - start_time
+            detection_time = time.perf_counter() - start_time
             self.performance_monitor.record_detection_time(detection_time)
             
             return detections
             
         except Exception as e:
             logger.error(f"物件偵測失敗: {e}")
-            return []
+            return DetectionBatch.empty()
+    
+    def _frame_unchanged(self, img: np.ndarray) -> bool:
+        """以 16x16 平均雜湊比對上次偵測的畫面，判斷是否可略過偵測"""
+        if not self._frame_skip_enabled:
+            return False
+        
+        small = cv2.cvtColor(cv2.resize(img, (16, 16), interpolation=cv2.INTER_AREA),
+                             cv2.COLOR_BGR2GRAY)
+        frame_hash = int.from_bytes(np.packbits(small > small.mean()).tobytes(), 'big')
+        now = time.perf_counter()
+        
+        # 容許少量位元差異以忽略角色待機動畫
+        if (self._last_frame_hash is not None
+                and _popcount(frame_hash ^ self._last_frame_hash) < self._hash_threshold
+                and now - self._last_detect_time < self._max_skip_seconds):
+            return True
+        
+        self._last_frame_hash = frame_hash
+        self._last_detect_time = now
+        return False
+    
+    def _start_track(self, img: np.ndarray, detection: Detection):
+        """為剛攻擊的目標建立追蹤器 (目標已在追蹤中則略過)"""
+        if not self._tracking_enabled:
+            return
+        
+        # 追蹤更新或略過偵測的幀會沿用同一個 Detection 物件，不重複建立追蹤器
+        if any(tracked is detection for tracked, _ in self._tracks):
+            return
+        
+        tracker = _create_tracker()
+        if tracker is None:
+            logger.warning("目標追蹤需要 opencv-contrib-python (CSRT/KCF)，停用目標追蹤")
+            self._tracking_enabled = False
+            return
+        
+        x1, y1, x2, y2 = detection.bbox
+        try:
+            tracker.init(np.ascontiguousarray(img), (x1, y1, x2 - x1, y2 - y1))
+            self._tracks.append((detection, tracker))
+        except Exception as e:
+            logger.debug("建立追蹤器失敗: %s", e)
+    
+    def _update_tracks(self, img: np.ndarray) -> DetectionBatch:
+        """以追蹤器更新目標位置，回傳仍在距離範圍內的偵測結果"""
+        frame = np.ascontiguousarray(img)
+        center_x, center_y = self._center
+        tracks = []
+        
+        for detection, tracker in self._tracks:
+            try:
+                ok, (x, y, w, h) = tracker.update(frame)
+            except cv2.error as e:
+                # 例如目標移到畫面邊緣時 ROI 為空，只放棄該目標的追蹤
+                logger.debug("追蹤器更新失敗: %s", e)
+                continue
+            if not ok:
+                continue
+            
+            x, y, w, h = int(x), int(y), int(w), int(h)
+            cx, cy = x + w // 2, y + h // 2
+            updated = Detection(
+                bbox=(x, y, x + w, y + h),
+                confidence=detection.confidence,
+                class_id=detection.class_id,
+                class_name=detection.class_name,
+                center=(cx, cy),
+                distance_sq=float((cx - center_x) ** 2 + (cy - center_y) ** 2),
+                label=detection.label
+            )
+            
+            _, max_distance_sq, _ = self._behavior.get(updated.class_name, self._default_behavior)
+            if updated.distance_sq <= max_distance_sq:
+                tracks.append((updated, tracker))
+        
+        self._tracks = tracks
+        return DetectionBatch.from_detections(
+            self._prioritize_detections([detection for detection, _ in tracks]))
     
     def _prioritize_detections(self, detections: List[Detection]) -> List[Detection]:
         """按優先級和距離排序偵測結果"""
-        priority_map = {name: i for i, name in enumerate(self.config.get('automation.priority_targets', []))}
+        priority_map = self._priority_map
         
         def sort_key(detection):
             priority = priority_map.get(detection.class_name, 999)
-            return (priority, detection.distance_from_center)
+            return (priority, detection.distance_sq)
         
         return sorted(detections, key=sort_key)
     
     def perform_action(self, detection: Detection) -> bool:
-        """執行優化的遊戲動作"""
-        class_name = detection.class_name
+        """執行優化的遊戲動作 (上一個動作的冷卻尚未結束時直接略過)"""
+        if time.perf_counter() < self._next_action_at:
+            return False
+        
         abs_x = self.monitor['left'] + detection.center[0]
         abs_y = self.monitor['top'] + detection.center[1]
         
         # 檢查距離限制
-        max_distance = self.config.get(f'detection_behavior.{class_name}.max_distance', 200)
-        if detection.distance_from_center > max_distance:
+        action, max_distance_sq, delay = self._behavior.get(detection.class_name, self._default_behavior)
+        if detection.distance_sq > max_distance_sq:
             return False
         
         try:
-            action_performed = False
-            
-            if class_name == 'mob':
-                # 檢查是否啟用攻擊動作
-                mob_action = self.config.get('detection_behavior.mob.action', 'attack')
-                if mob_action == 'attack':
-                    pyautogui.moveTo(abs_x, abs_y, duration=0.1)
-                    attack_method = self.config.get('controls.attack_method', 'click')
-                    if attack_method == 'key':
-                        attack_key = self.config.get('controls.attack_key', 'z')
-                        pyautogui.press(attack_key)
-                    else:
-                        pyautogui.click()
-                    logger.info(f"⚔️ 攻擊怪物 (信賴度: {detection.confidence:.2f})")
-                    self.stats['mobs_attacked'] += 1
-                    action_performed = True
-                    time.sleep(self.config.get('detection_behavior.mob.attack_delay', 0.5))
-                else:
-                    logger.info(f"👁️ 偵測到怪物 (信賴度: {detection.confidence:.2f}) - 僅記錄")
-                
-            elif class_name == 'item':
-                # 只偵測物品，不執行動作
-                logger.info(f"👁️ 偵測到物品 (信賴度: {detection.confidence:.2f}) - 僅記錄")
-                
-            elif class_name == 'npc':
-                # 只偵測 NPC，不執行動作
-                logger.info(f"👁️ 偵測到 NPC (信賴度: {detection.confidence:.2f}) - 僅記錄")
-            
-            if action_performed:
+            handler = self._action_dispatch.get(action, self._do_log_only)
+            if handler(abs_x, abs_y, detection, delay):
                 self.stats['actions_performed'] += 1
                 return True
                 
@@ -320,9 +1024,83 @@ class OptimizedMapleBot:
         
         return False
     
+    def _do_attack(self, abs_x: int, abs_y: int, detection: Detection, delay: float) -> bool:
+        """攻擊目標"""
+        pyautogui.moveTo(abs_x, abs_y, duration=0.1, _pause=False)
+        if self._controls['attack_method'] == 'key':
+            pyautogui.press(self._controls['attack_key'])
+        else:
+            pyautogui.click()
+        # 其他類別也可設定為 attack，只有怪物計入怪物攻擊統計
+        if detection.class_name == 'mob':
+            logger.info("⚔️ 攻擊怪物 (信賴度: %.2f)", detection.confidence)
+            self.stats['mobs_attacked'] += 1
+        else:
+            logger.info("⚔️ 攻擊 %s (信賴度: %.2f)", detection.class_name, detection.confidence)
+        self._schedule_next_action(delay)
+        return True
+    
+    def _do_pickup(self, abs_x: int, abs_y: int, detection: Detection, delay: float) -> bool:
+        """撿取物品"""
+        pyautogui.moveTo(abs_x, abs_y, duration=0.1, _pause=False)
+        pyautogui.press(self._controls['pickup_key'])
+        logger.info("💰 撿取物品 (信賴度: %.2f)", detection.confidence)
+        self.stats['items_collected'] += 1
+        self._schedule_next_action(delay)
+        return True
+    
+    def _do_interact(self, abs_x: int, abs_y: int, detection: Detection, delay: float) -> bool:
+        """與 NPC 互動"""
+        pyautogui.moveTo(abs_x, abs_y, duration=0.1, _pause=False)
+        pyautogui.press(self._controls['interact_key'])
+        logger.info("💬 與 NPC 互動 (信賴度: %.2f)", detection.confidence)
+        self.stats['npcs_interacted'] += 1
+        self._schedule_next_action(delay)
+        return True
+    
+    def _schedule_next_action(self, delay: float):
+        """登記下一個動作最早可執行的時間：取動作延遲與動作間隔的較大值"""
+        self._next_action_at = time.perf_counter() + max(self._pyautogui_pause, delay, self.action_delay)
+    
+    def _hold_key(self, key: str, duration: float):
+        """按下按鍵並登記放開時間，由主迴圈的 _release_due_key 放開，不阻塞偵測
+        
+        自動化迴圈未執行時 (例如工具直接呼叫搜尋方法) 沒有人會放開按鍵，改為阻塞按住後放開
+        """
+        self._release_held_key()
+        if not self.running:
+            pyautogui.keyDown(key)
+            try:
+                time.sleep(duration)
+            finally:
+                pyautogui.keyUp(key)
+            return
+        
+        pyautogui.keyDown(key)
+        self._held_key = key
+        self._key_release_at = time.perf_counter() + duration
+    
+    def _release_due_key(self):
+        """按住時間已到時放開按鍵"""
+        if self._held_key is not None and time.perf_counter() >= self._key_release_at:
+            self._release_held_key()
+    
+    def _release_held_key(self):
+        """立即放開目前按住的按鍵"""
+        if self._held_key is not None:
+            key, self._held_key = self._held_key, None
+            pyautogui.keyUp(key)
+    
+    def _do_log_only(self, abs_x: int, abs_y: int, detection: Detection, delay: float) -> bool:
+        """只偵測不執行動作"""
+        label = _LOG_ONLY_LABELS.get(detection.class_name)
+        if label:
+            logger.info("👁️ 偵測到%s (信賴度: %.2f) - 僅記錄", label, detection.confidence)
+        return False
+    
     def _should_search_for_mobs(self) -> bool:
         """檢查是否應該開始尋找怪物"""
-        if not self.config.get('automation.mob_hunting.enable', True):
+        if not self._mob_hunting_enabled:
             return False
         
         # 如果正在搜尋中，不重複開始
@@ -330,10 +1108,9 @@ class OptimizedMapleBot:
             return False
         
         # 檢查距離上次偵測到怪物的時間
-        search_delay = self.config.get('automation.mob_hunting.search_delay', 2.0)
-        time_since_last_mob = time.time() - self.last_mob_detection_time
+        time_since_last_mob = time.perf_counter() - self.last_mob_detection_time
         
-        return time_since_last_mob > search_delay
+        return time_since_last_mob > self._search_delay
     
     def _start_mob_search(self):
         """開始尋找怪物"""
@@ -341,11 +1118,11 @@ class OptimizedMapleBot:
             return
         
         self.is_searching = True
-        self.search_start_time = time.time()
+        self.search_start_time = time.perf_counter()
         self.search_moves = 0
         
         # 記錄當前位置（假設角色在畫面中心）
-        self.original_position = (self.monitor['width'] // 2, self.monitor['height'] // 2)
+        self.original_position = self._center
         
         logger.info("🔍 開始尋找怪物...")
     
@@ -354,13 +1131,17 @@ class OptimizedMapleBot:
         if not self.is_searching:
             return
         
-        max_search_time = self.config.get('automation.mob_hunting.max_search_time', 10)
-        if time.time() - self.search_start_time > max_search_time:
+        now = time.perf_counter()
+        if now - self.search_start_time > self._max_search_time:
             self._end_mob_search()
             return
         
-        search_pattern = self.config.get('automation.mob_hunting.search_pattern', 'horizontal')
-        move_distance = self.config.get('automation.mob_hunting.move_distance', 100)
+        # 上一次移動 (含按住時間與移動後停頓) 尚未結束
+        if now < self._next_search_move_at:
+            return
+        
+        search_pattern = self._search_pattern
+        move_distance = self._move_distance
         
         try:
             if search_pattern == 'horizontal':
@@ -370,7 +1151,8 @@ class OptimizedMapleBot:
             elif search_pattern == 'random':
                 self._random_search(move_distance)
             
-            time.sleep(0.5)  # 移動後稍作停頓
+            # 按鍵放開後稍作停頓再進行下一次移動
+            self._next_search_move_at = max(self._key_release_at, time.perf_counter()) + 0.5
             
         except Exception as e:
             logger.error(f"搜尋移動失敗: {e}")
@@ -378,12 +1160,10 @@ class OptimizedMapleBot:
     
     def _horizontal_search(self, move_distance: int):
         """水平搜尋移動"""
-        move_key = self.config.get('controls.movement_keys.right' if self.search_direction > 0 else 'controls.movement_keys.left', 'right' if self.search_direction > 0 else 'left')
+        move_key = self._move_keys['right' if self.search_direction > 0 else 'left']
         
         # 按住移動鍵一段時間
-        pyautogui.keyDown(move_key)
-        time.sleep(0.3)
-        pyautogui.keyUp(move_key)
+        self._hold_key(move_key, 0.3)
         
         self.search_moves += 1
         
@@ -397,35 +1177,24 @@ class OptimizedMapleBot:
         """垂直搜尋移動（跳躍和下降）"""
         if self.search_moves % 2 == 0:
             # 跳躍
-            jump_key = self.config.get('controls.movement_keys.jump', 'x')
-            pyautogui.press(jump_key)
+            pyautogui.press(self._move_keys['jump'])
             logger.info("⬆️ 跳躍搜尋")
         else:
             # 向下移動
-            down_key = self.config.get('controls.movement_keys.down', 'down')
-            pyautogui.keyDown(down_key)
-            time.sleep(0.2)
-            pyautogui.keyUp(down_key)
+            self._hold_key(self._move_keys['down'], 0.2)
             logger.info("⬇️ 向下搜尋")
         
         self.search_moves += 1
     
     def _random_search(self, move_distance: int):
         """隨機搜尋移動"""
-        import random
-        
-        movements = ['left', 'right', 'jump']
-        chosen_movement = random.choice(movements)
+        chosen_movement = _SEARCH_MOVEMENTS[self._rng.integers(len(_SEARCH_MOVEMENTS))]
         
         if chosen_movement == 'jump':
-            jump_key = self.config.get('controls.movement_keys.jump', 'x')
-            pyautogui.press(jump_key)
+            pyautogui.press(self._move_keys['jump'])
             logger.info("🎲 隨機跳躍")
         else:
-            move_key = self.config.get(f'controls.movement_keys.{chosen_movement}', chosen_movement)
-            pyautogui.keyDown(move_key)
-            time.sleep(0.3)
-            pyautogui.keyUp(move_key)
+            self._hold_key(self._move_keys[chosen_movement], 0.3)
             logger.info(f"🎲 隨機移動: {chosen_movement}")
         
         self.search_moves += 1
@@ -436,7 +1205,7 @@ class OptimizedMapleBot:
             return
         
         # 記錄搜尋統計
-        search_duration = time.time() - self.search_start_time
+        search_duration = time.perf_counter() - self.search_start_time
         self.stats['searches_performed'] += 1
         self.stats['search_time_total'] += search_duration
         
@@ -444,7 +1213,7 @@ class OptimizedMapleBot:
         logger.info(f"🏁 結束怪物搜尋 (耗時: {search_duration:.1f}秒)")
         
         # 如果設定要返回中心，執行返回動作
-        if self.config.get('automation.mob_hunting.return_to_center', True):
+        if self._return_to_center_enabled:
             self._return_to_center()
     
     def _return_to_center(self):
@@ -454,21 +1223,19 @@ class OptimizedMapleBot:
             # 簡單的返回邏輯：向相反方向移動
             if self.search_direction > 0:
                 # 如果最後是向右移動，現在向左移動
-                move_key = self.config.get('controls.movement_keys.left', 'left')
+                move_key = self._move_keys['left']
             else:
                 # 如果最後是向左移動，現在向右移動
-                move_key = self.config.get('controls.movement_keys.right', 'right')
+                move_key = self._move_keys['right']
             
-            pyautogui.keyDown(move_key)
-            time.sleep(0.5)  # 移動時間稍長一些
-            pyautogui.keyUp(move_key)
+            self._hold_key(move_key, 0.5)  # 移動時間稍長一些
             
         except Exception as e:
             logger.error(f"返回中心失敗: {e}")
     
     def _check_safety_conditions(self) -> bool:
         """檢查安全條件"""
-        if self.start_time and time.time() - self.start_time > self.max_runtime:
+        if self.start_time and time.perf_counter() - self.start_time > self.max_runtime:
             logger.warning("達到最大運行時間限制")
             return False
         return True
@@ -479,12 +1246,45 @@ class OptimizedMapleBot:
             logger.error("模型未載入，無法開始自動化")
             return
         
+        # 配置文件有修改才重新解析並套用
+        if self.config.reload_if_changed():
+            logger.info("🔄 配置文件已更新，重新套用設定")
+            self._apply_runtime_overrides()
+            self._apply_config_settings()
+            self._build_infer_kwargs()
+        
         self.running = True
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         logger.info("🚀 開始 MapleStory Worlds 優化自動化")
-        logger.info("按 'q' 鍵暫停/恢復，'Esc' 鍵停止")
+        if show_preview:
+            logger.info("在預覽視窗按 'q' 鍵暫停/恢復，'Esc' 鍵停止")
+        else:
+            logger.info("無預覽模式，按 Ctrl+C 停止")
+        
+        last_stats_time = time.perf_counter()
         
-        last_stats_time = time.time()
+        # 擷取在背景執行緒進行，與偵測/動作重疊
+        self._frame_q = queue.Queue(maxsize=1)
+        # 預覽執行緒佇列中與繪製中的畫面各需一個額外緩衝區
+        self._allocate_frame_pool(_FRAME_POOL_SIZE + (2 if show_preview else 0))
+        self._tracks = []
+        img = None
+        capture_thread = threading.Thread(target=self._capture_loop, name="capture", daemon=True)
+        capture_thread.start()
+        
+        # 預覽繪製與視窗事件在獨立執行緒處理，避免拖慢偵測 (macOS 除外)
+        preview_thread = None
+        preview_inline = show_preview and _PREVIEW_ON_MAIN_THREAD
+        if preview_inline:
+            self._create_preview_window()
+        elif show_preview:
+            self._preview_q = queue.Queue(maxsize=1)
+            preview_thread = threading.Thread(target=self._preview_worker, name="preview", daemon=True)
+            preview_thread.start()
+        
+        # 以絕對截止時間控制掃描週期；Windows 上暫時提高計時器解析度
+        _set_timer_resolution(True)
+        scheduler = DeadlineScheduler(self.scan_interval)
         
         try:
             while self.running:
@@ -492,35 +1292,55 @@ class OptimizedMapleBot:
                     break
                 
                 if self.paused:
+                    self._release_held_key()
+                    if preview_inline:
+                        self._handle_key(_poll_key() & 0xFF)
                     time.sleep(0.1)
+                    scheduler.reset()
                     continue
                 
-                # 擷取和偵測
-                img = self.capture_screen()
-                if img is None:
+                # 放開按住時間已到的移動鍵
+                self._release_due_key()
+                
+                # 取得最新畫面並偵測 (先歸還上一幀的緩衝區)
+                if img is not None:
+                    self._release_frame(img)
+                    img = None
+                try:
+                    img = self._frame_q.get(timeout=1.0)
+                except queue.Empty:
                     continue
                 
-                detections = self.detect_objects(img)
+                if self._frame_unchanged(img):
+                    detections = self._last_detections
+                else:
+                    # 追蹤中的目標以追蹤器更新，每隔數幀才做一次全畫面偵測
+                    detections = DetectionBatch.empty()
+                    if self._tracks and self._frames_since_full_detect < self._full_detect_interval:
+                        detections = self._update_tracks(img)
+                        self._frames_since_full_detect += 1
+                    if not detections:
+                        self._tracks = []
+                        self._frames_since_full_detect = 0
+                        detections = self.detect_objects(img)
+                    self._last_detections = detections
                 
                 # 檢查是否偵測到怪物，更新最後偵測時間
-                mob_detected = any(d.class_name == 'mob' for d in detections)
+                mob_detected = detections.mob_detected
                 if mob_detected:
-                    self.last_mob_detection_time = time.time()
+                    self.last_mob_detection_time = time.perf_counter()
                     # 如果正在搜尋中且偵測到怪物，停止搜尋
                     if self.is_searching:
                         self._end_mob_search()
                 
-                # 執行動作
-                actions_this_cycle = 0
+                # 執行動作 (成功後進入冷卻，本週期其餘目標不會再執行)
                 for detection in detections:
                     if not self.running or self.paused:
                         break
                     
                     if self.perform_action(detection):
-                        actions_this_cycle += 1
-                        if actions_this_cycle >= 3:  # 限制每週期最多執行3個動作
-                            break
-                        time.sleep(self.action_delay)
+                        self._start_track(img, detection)
+                        break
                 
                 # 如果沒有偵測到怪物且不在搜尋中，檢查是否需要開始搜尋
                 if not mob_detected and self._should_search_for_mobs():
@@ -530,28 +1350,26 @@ class OptimizedMapleBot:
                 if self.is_searching:
                     self._perform_mob_search()
                 
-                # 顯示預覽
+                # 顯示預覽 (畫面緩衝區交由預覽執行緒或 _show_preview 歸還)
                 if show_preview and detections:
-                    preview_img = self._draw_detections(img.copy(), detections)
-                    cv2.imshow('MapleStory Auto Bot - 按 q 暫停/恢復', preview_img)
+                    if preview_inline:
+                        self._show_preview(img, detections)
+                    else:
+                        self._submit_preview(img, detections)
+                    img = None
+                if preview_inline:
+                    self._handle_key(_poll_key() & 0xFF)
                 
                 # 更新性能監控
                 self.performance_monitor.update_fps()
                 
                 # 定期顯示統計
-                if time.time() - last_stats_time >= 30:  # 每30秒顯示一次
+                if time.perf_counter() - last_stats_time >= 30:  # 每30秒顯示一次
                     self._log_statistics()
-                    last_stats_time = time.time()
+                    last_stats_time = time.perf_counter()
                 
-                # 檢查按鍵
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    self.paused = not self.paused
-                    logger.info(f"{'⏸️ 暫停' if self.paused else '▶️ 恢復'}自動化")
-                elif key == 27:  # Esc
-                    break
-                
-                time.sleep(self.scan_interval)
+                # 等待到下一個掃描截止時間
+                scheduler.wait()
                 
         except KeyboardInterrupt:
             logger.info("⏹️ 使用者中斷自動化")
@@ -559,60 +1377,174 @@ class OptimizedMapleBot:
             logger.error(f"自動化過程中發生錯誤: {e}")
         finally:
             self.running = False
-            cv2.destroyAllWindows()
+            self._release_held_key()
+            capture_thread.join(timeout=1.0)
+            if preview_thread is not None:
+                preview_thread.join(timeout=0.5)
+            if preview_inline:
+                self._close_preview_window()
+            _set_timer_resolution(False)
             self._log_final_statistics()
             logger.info("✅ 自動化已停止")
     
-    def _draw_detections(self, img: np.ndarray, detections: List[Detection]) -> np.ndarray:
-        """繪製偵測結果"""
-        for detection in detections:
-            bbox = detection.bbox
-            class_name = detection.class_name
-            confidence = detection.confidence
+    def _allocate_frame_pool(self, size: int = _FRAME_POOL_SIZE):
+        """預先配置擷取緩衝區，避免每幀重新配置記憶體"""
+        shape = (self.monitor['height'], self.monitor['width'], 3)
+        self._frame_pool = [np.empty(shape, dtype=np.uint8) for _ in range(size)]
+        self._free_frames = queue.SimpleQueue()
+        for buf in self._frame_pool:
+            self._free_frames.put(buf)
+    
+    def _handle_key(self, key: int):
+        """處理預覽視窗按鍵：q 暫停/恢復，Esc 停止"""
+        if key == ord('q'):
+            self.paused = not self.paused
+            logger.info(f"{'⏸️ 暫停' if self.paused else '▶️ 恢復'}自動化")
+        elif key == 27:  # Esc
+            self.running = False
+    
+    def _submit_preview(self, img: np.ndarray, detections: DetectionBatch):
+        """將畫面交給預覽執行緒，佇列已滿時丟棄舊畫面"""
+        try:
+            self._preview_q.put_nowait((img, detections))
+        except queue.Full:
+            try:
+                old_img, _ = self._preview_q.get_nowait()
+                self._release_frame(old_img)
+            except queue.Empty:
+                pass
+            self._preview_q.put_nowait((img, detections))
+    
+    def _preview_worker(self):
+        """預覽執行緒：繪製偵測結果、顯示視窗並處理按鍵 (視窗由本執行緒建立與關閉)"""
+        self._create_preview_window()
+        try:
+            while self.running:
+                try:
+                    img, detections = self._preview_q.get(timeout=0.1)
+                except queue.Empty:
+                    self._handle_key(_poll_key() & 0xFF)
+                    continue
+                
+                self._show_preview(img, detections)
+                self._handle_key(_poll_key() & 0xFF)
+        finally:
+            self._close_preview_window()
+    
+    def _show_preview(self, img: np.ndarray, detections: DetectionBatch):
+        """繪製偵測結果並顯示，完成後歸還畫面緩衝區 (須在建立視窗的執行緒呼叫)"""
+        preview_img = self._draw_detections(self._preview_frame(img), detections)
+        cv2.imshow(PREVIEW_WINDOW_NAME, preview_img)
+        self._release_frame(img)
+    
+    def _close_preview_window(self):
+        """關閉預覽視窗 (須在建立視窗的執行緒呼叫)"""
+        cv2.destroyWindow(PREVIEW_WINDOW_NAME)
+        _poll_key()  # 處理關閉事件，讓視窗實際消失
+    
+    def _create_preview_window(self):
+        """建立預覽視窗，優先以 OpenGL 紋理顯示，減少 CPU 端的視窗繪製"""
+        if self.config.get('automation.preview_opengl', True):
+            try:
+                cv2.namedWindow(PREVIEW_WINDOW_NAME, cv2.WINDOW_AUTOSIZE | cv2.WINDOW_OPENGL)
+                return
+            except cv2.error:
+                logger.info("OpenCV 未支援 OpenGL，預覽改用一般視窗")
+        cv2.namedWindow(PREVIEW_WINDOW_NAME, cv2.WINDOW_AUTOSIZE)
+    
+    def _preview_frame(self, img: np.ndarray) -> np.ndarray:
+        """取得可繪製的畫面：自有緩衝區直接繪製，否則複製到固定的預覽緩衝區"""
+        if img is self._preview_buf or any(img is buf for buf in self._frame_pool):
+            return img
+        
+        if self._preview_buf is None or self._preview_buf.shape != img.shape:
+            self._preview_buf = np.empty(img.shape, dtype=np.uint8)
+        np.copyto(self._preview_buf, img)
+        return self._preview_buf
+    
+    def _release_frame(self, img: np.ndarray):
+        """將處理完的畫面緩衝區歸還給擷取執行緒"""
+        if any(img is buf for buf in self._frame_pool):
+            self._free_frames.put(img)
+    
+    def _capture_loop(self):
+        """背景擷取執行緒：持續擷取畫面，佇列只保留最新一幀"""
+        scheduler = DeadlineScheduler(self.scan_interval)
+        while self.running:
+            if self.paused:
+                time.sleep(0.1)
+                scheduler.reset()
+                continue
             
-            # 根據類型設定顏色
-            color_map = {
-                'mob': (0, 0, 255),      # 紅色
-                'item': (0, 255, 0),     # 綠色
-                'npc': (255, 0, 0),      # 藍色
-                'character': (255, 255, 0), # 青色
-                'environment': (128, 128, 128), # 灰色
-                'ui': (255, 0, 255)      # 洋紅色
-            }
-            color = color_map.get(class_name, (255, 255, 255))
+            try:
+                buf = self._free_frames.get_nowait()
+            except queue.Empty:
+                buf = None
+            
+            img = self.capture_screen(out=buf)
+            if buf is not None and img is not buf:
+                self._release_frame(buf)
+            
+            if img is not None:
+                try:
+                    self._frame_q.put_nowait(img)
+                except queue.Full:
+                    # 丟棄尚未處理的舊畫面並歸還其緩衝區
+                    try:
+                        self._release_frame(self._frame_q.get_nowait())
+                    except queue.Empty:
+                        pass
+                    self._frame_q.put_nowait(img)
+            
+            scheduler.wait()
+        
+        self._capturer.close_thread()
+    
+    def _draw_detections(self, img: np.ndarray, detections: DetectionBatch) -> np.ndarray:
+        """繪製偵測結果"""
+        # 陣列結構直接取座標與標籤，不建立 Detection 物件
+        boxes = zip(detections.bboxes.tolist(), detections.class_ids.tolist(), detections.labels)
+        
+        class_colors = self._class_colors
+        for (x1, y1, x2, y2), class_id, label in boxes:
+            color = class_colors[class_id]
             
             # 繪製邊界框
-            cv2.rectangle(img, (bbox[0], bbox[1]), (bbox[2], bbox[3]), color, 2)
+            cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
             
-            # 繪製標籤
-            label = f"{class_name}: {confidence:.2f}"
-            cv2.putText(img, label, (bbox[0], bbox[1] - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+            # 繪製標籤 (標籤字串已預先格式化)
+            cv2.putText(img, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
         
-        # 繪製性能信息
-        fps_text = f"FPS: {self.performance_monitor.current_fps}"
-        cv2.putText(img, fps_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        # 繪製性能信息 (FPS 數值改變時才重新格式化)
+        fps = self.performance_monitor.current_fps
+        if fps != self._fps_text_value:
+            self._fps_text_value = fps
+            self._fps_text = f"FPS: {fps}"
+        cv2.putText(img, self._fps_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
         return img
     
     def _log_statistics(self):
         """記錄統計信息"""
-        runtime = time.time() - self.start_time if self.start_time else 0
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        runtime = time.perf_counter() - self.start_time if self.start_time else 0
         avg_detection_time = self.performance_monitor.get_avg_detection_time()
         
+        stats = self.stats
         logger.info("📊 運行統計:")
-        logger.info(f"   運行時間: {runtime/60:.1f} 分鐘")
-        logger.info(f"   FPS: {self.performance_monitor.current_fps}")
-        logger.info(f"   平均偵測時間: {avg_detection_time*1000:.1f}ms")
-        logger.info(f"   總偵測次數: {self.stats['detections']}")
-        logger.info(f"   執行動作: {self.stats['actions_performed']}")
-        logger.info(f"   撿取物品: {self.stats['items_collected']}")
-        logger.info(f"   攻擊怪物: {self.stats['mobs_attacked']}")
-        logger.info(f"   NPC互動: {self.stats['npcs_interacted']}")
-        logger.info(f"   搜尋次數: {self.stats['searches_performed']}")
-        if self.stats['searches_performed'] > 0:
-            avg_search_time = self.stats['search_time_total'] / self.stats['searches_performed']
-            logger.info(f"   平均搜尋時間: {avg_search_time:.1f}秒")
+        logger.info("   運行時間: %.1f 分鐘", runtime / 60)
+        logger.info("   FPS: %s", self.performance_monitor.current_fps)
+        logger.info("   平均偵測時間: %.1fms", avg_detection_time * 1000)
+        logger.info("   總偵測次數: %d", stats['detections'])
+        logger.info("   執行動作: %d", stats['actions_performed'])
+        logger.info("   撿取物品: %d", stats['items_collected'])
+        logger.info("   攻擊怪物: %d", stats['mobs_attacked'])
+        logger.info("   NPC互動: %d", stats['npcs_interacted'])
+        logger.info("   搜尋次數: %d", stats['searches_performed'])
+        if stats['searches_performed'] > 0:
+            logger.info("   平均搜尋時間: %.1f秒", stats['search_time_total'] / stats['searches_performed'])
     
     def _log_final_statistics(self):
         """記錄最終統計"""
@@ -621,7 +1553,7 @@ class OptimizedMapleBot:
     
     def get_performance_summary(self) -> Dict:
         """獲取性能摘要"""
-        runtime = time.time() - self.start_time if self.start_time else 0
+        runtime = time.perf_counter() - self.start_time if self.start_time else 0
         avg_detection_time = self.performance_monitor.get_avg_detection_time()
         
         return {
@@ -644,19 +1576,26 @@ class OptimizedMapleBot:
             return
         
         logger.info("🧪 測試物件偵測功能")
-        img = self.capture_screen()
+        # 直接擷取到固定的預覽緩衝區，繪圖時不必再複製整幀
+        shape = (self.monitor['height'], self.monitor['width'], 3)
+        if self._preview_buf is None or self._preview_buf.shape != shape:
+            self._preview_buf = np.empty(shape, dtype=np.uint8)
+        img = self.capture_screen(out=self._preview_buf)
         if img is None:
             logger.error("無法擷取畫面")
             return
         
         detections = self.detect_objects(img)
-        logger.info(f"📊 偵測結果: 發現 {len(detections)} 個物件")
+        logger.info("📊 偵測結果: 發現 %d 個物件", len(detections))
         
-        for i, detection in enumerate(detections, 1):
-            logger.info(f"  {i}. {detection.class_name} (信賴度: {detection.confidence:.2f}, 距離: {detection.distance_from_center:.0f}px)")
+        # 逐一列出需要建立 Detection 並計算距離，INFO 關閉時整段略過
+        if logger.isEnabledFor(logging.INFO):
+            for i, detection in enumerate(detections, 1):
+                logger.info("  %d. %s (信賴度: %.2f, 距離: %.0fpx)", i, detection.class_name,
+                            detection.confidence, detection.distance_from_center)
         
         if detections:
-            result_img = self._draw_detections(img, detections)
+            result_img = self._draw_detections(self._preview_frame(img), detections)
             cv2.imshow('Detection Test', result_img)
             logger.info("按任意鍵關閉預覽視窗")
             cv2.waitKey(0)
@@ -664,21 +1603,38 @@ class OptimizedMapleBot:
         else:
             logger.info("未偵測到任何物件")
 
+# 模型清單快取 (weights 目錄 mtime_ns, [(路徑, 大小 MB)])
+_model_list_cache: Optional[Tuple[int, List[Tuple[str, float]]]] = None
+
 def load_available_models() -> Dict[str, str]:
-    """載入可用的模型文件"""
+    """載入可用的模型文件 (weights 目錄未變動時沿用上次掃描結果)"""
+    global _model_list_cache
     models = {}
-    weights_dir = Path("weights")
+    weights_dir = "weights"
     
-    if weights_dir.exists():
-        for i, model_file in enumerate(weights_dir.glob("*.pt"), 1):
-            size_mb = model_file.stat().st_size / (1024 * 1024)
-            models[str(i)] = str(model_file)
-            print(f"  {i}. {model_file} ({size_mb:.1f} MB)")
+    try:
+        mtime_ns = os.stat(weights_dir).st_mtime_ns
+    except OSError:
+        return models
+    
+    if _model_list_cache is None or _model_list_cache[0] != mtime_ns:
+        # 單次 scandir 走訪，DirEntry 會快取檔案資訊
+        with os.scandir(weights_dir) as it:
+            entries = sorted(
+                (e for e in it if e.is_file() and e.name.endswith(MODEL_EXTENSIONS)),
+                key=lambda e: e.name
+            )
+        _model_list_cache = (mtime_ns, [(e.path, e.stat().st_size / (1024 * 1024)) for e in entries])
+    
+    for i, (path, size_mb) in enumerate(_model_list_cache[1], 1):
+        models[str(i)] = path
+        print(f"  {i}. {path} ({size_mb:.1f} MB)")
     
     return models
 
 def main():
     """主程序"""
+    setup_logging()
     print("🍁 MapleStory Worlds 優化自動化系統 v2.0")
     print("=" * 60)
     
@@ -694,22 +1650,22 @@ def main():
         logger.error("未找到任何模型文件")
         return
     
-    # 選擇模型
-    choice = input(f"\n請選擇模型文件 (1-{len(models)}, 預設1): ").strip()
+    # 選擇模型 (預設為配置中的 model.default_path，不在清單中時為第一個)
+    config = ConfigManager()
+    configured_path = os.path.normpath(config.get('model.default_path') or '')
+    default_choice = next((key for key, path in models.items()
+                           if os.path.normpath(path) == configured_path), '1')
+    choice = input(f"\n請選擇模型文件 (1-{len(models)}, 預設{default_choice}): ").strip()
     if choice not in models:
-        choice = '1'
+        choice = default_choice
     
     model_path = models[choice]
-    if not os.path.exists(model_path):
-        logger.error(f"選擇的模型文件不存在: {model_path}")
+    if not os.path.isfile(model_path):
+        logger.error("選擇的模型文件不存在: %s", model_path)
         return
     
-    # 創建配置並設定模型路徑
-    config = ConfigManager()
-    config.config['model']['default_path'] = model_path
-    
-    # 創建機器人
-    bot = OptimizedMapleBot()
+    # 創建機器人 (沿用同一份配置，並以選擇的模型覆寫預設路徑)
+    bot = OptimizedMapleBot(config_manager=config, model_path=model_path)
     
     # 主選單
     while True:
@@ -741,6 +1697,7 @@ def main():
         else:
             print("❌ 無效選擇")
     
+    bot.close()
     print("👋 再見！")
 
 def _adjust_window_settings(bot):
@@ -757,19 +1714,24 @@ def _adjust_window_settings(bot):
     
     preset_choice = input("選擇預設或自訂 (1-3): ").strip()
     
-    if preset_choice == '1':
-        bot.monitor = {'left': 0, 'top': 100, 'width': 1920, 'height': 980}
-    elif preset_choice == '2':
-        bot.monitor = {'left': 320, 'top': 180, 'width': 1280, 'height': 720}
+    preset = _MONITOR_PRESETS.get(preset_choice)
+    if preset is not None:
+        bot.set_monitor(dict(preset))  # 複製一份，避免共用預設值物件
     elif preset_choice == '3':
+        # 先讀取並驗證全部欄位，全部有效才一次套用
+        prompts = (('left', "請輸入左側位置: "), ('top', "請輸入頂部位置: "),
+                   ('width', "請輸入寬度: "), ('height', "請輸入高度: "))
+        raw_values = {key: input(prompt).strip() for key, prompt in prompts}
         try:
-            bot.monitor['left'] = int(input("請輸入左側位置: ") or bot.monitor['left'])
-            bot.monitor['top'] = int(input("請輸入頂部位置: ") or bot.monitor['top'])
-            bot.monitor['width'] = int(input("請輸入寬度: ") or bot.monitor['width'])
-            bot.monitor['height'] = int(input("請輸入高度: ") or bot.monitor['height'])
+            monitor = {key: int(raw_values[key]) if raw_values[key] else bot.monitor[key]
+                       for key, _ in prompts}
         except ValueError:
-            print("❌ 輸入格式錯誤")
+            print("❌ 輸入格式錯誤，視窗設定未變更")
+            return
+        if monitor['width'] <= 0 or monitor['height'] <= 0:
+            print("❌ 寬度與高度必須大於 0，視窗設定未變更")
             return
+        bot.set_monitor(monitor)
     
     print("✅ 視窗設定已更新")
 
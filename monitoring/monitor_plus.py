@@ -22,6 +22,12 @@ import matplotlib.dates as mdates
 from collections import deque
 import yaml
 
+# 優先使用 libyaml 的 C 版載入器
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # 配置日誌
 logging.basicConfig(
     level=logging.INFO,
@@ -77,7 +83,7 @@ class PerformanceAnalyzer:
     def __init__(self, max_history: int = 1000):
         self.max_history = max_history
         self.history = deque(maxlen=max_history)
-        self.alerts = []
+        self.alerts = deque(maxlen=100)  # 只保留最近100個告警
     
     def add_snapshot(self, snapshot: SystemSnapshot):
         """添加系統快照"""
@@ -113,10 +119,6 @@ class PerformanceAnalyzer:
         }
         self.alerts.append(alert)
         logger.warning(f"⚠️ {message}")
-        
-        # 只保留最近100個告警
-        if len(self.alerts) > 100:
-            self.alerts.pop(0)
     
     def get_performance_summary(self) -> Dict:
         """獲取性能摘要"""
@@ -203,7 +205,7 @@ class EnhancedMapleMonitor:
         if Path(config_path).exists():
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f)
+                    config = yaml.load(f, Loader=YamlLoader)
                     default_config.update(config)
             except Exception as e:
                 logger.error(f"載入配置失敗: {e}")
@@ -377,12 +379,14 @@ class EnhancedMapleMonitor:
                         'timestamp': a['timestamp'].isoformat(),
                         'type': a['type'],
                         'message': a['message']
-                    } for a in self.analyzer.alerts[-50:]  # 最近50個告警
+                    } for a in list(self.analyzer.alerts)[-50:]  # 最近50個告警
                 ]
             }
             
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 先整份序列化後一次寫入暫存檔，再以原子替換覆蓋，避免中途中斷留下損壞的 JSON
+            tmp_file = self.data_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+            tmp_file.replace(self.data_file)
             
             logger.debug(f"數據已保存到 {self.data_file}")
             
@@ -89,7 +89,9 @@ def check_model_files():
         print("❌ weights 目錄不存在")
         return False
     
-    model_files = list(weights_dir.glob("*.pt"))
+    # 單次 scandir 走訪，DirEntry 會快取檔案類型與大小資訊
+    with os.scandir(weights_dir) as it:
+        model_files = [e for e in it if e.name.endswith('.pt') and e.is_file()]
     if not model_files:
         print("❌ 未找到 .pt 模型文件")
         return False
@@ -11,6 +11,12 @@ from pathlib import Path
 import json
 import yaml
 
+# 優先使用 libyaml 的 C 版載入器
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 def check_file_exists(file_path, description):
     """檢查文件是否存在"""
     if Path(file_path).exists():
@@ -34,7 +40,7 @@ def check_config_file():
     
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
         
         required_sections = ['model', 'window', 'controls', 'automation', 'safety']
         missing_sections = []
@@ -5,6 +5,8 @@ MapleStory Worlds 錯誤診斷腳本
 檢查常見問題和提供修復建議
 """
 
+import glob
+import os
 import sys
 import traceback
 from pathlib import Path
@@ -118,7 +120,9 @@ def test_model_files():
         print("❌ weights 目錄不存在")
         return False
     
-    model_files = list(weights_dir.glob('*.pt'))
+    # 單次 scandir 走訪，DirEntry 會快取檔案類型與大小資訊
+    with os.scandir(weights_dir) as it:
+        model_files = [e for e in it if e.name.endswith('.pt') and e.is_file()]
     if not model_files:
         print("❌ 未找到 .pt 模型文件")
         return False
@@ -144,10 +148,11 @@ def test_yolo_model_load():
         from ultralytics import YOLO
         
         model_path = "weights/best.pt"
-        if not Path(model_path).exists():
-            model_files = list(Path('weights').glob('*.pt'))
-            if model_files:
-                model_path = str(model_files[0])
+        if not os.path.isfile(model_path):
+            # 只需要第一個符合的檔案，找到即停止走訪
+            first_model = next(glob.iglob('weights/*.pt'), None)
+            if first_model is not None:
+                model_path = first_model
             else:
                 print("❌ 沒有可用的模型文件")
                 return False
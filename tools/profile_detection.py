@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MapleStory Worlds 偵測效能分析工具
+以 cProfile 只分析擷取與偵測流程 (不含匯入與模型載入)，結果輸出為 .prof 檔
+用法: python tools/profile_detection.py [幀數] [輸出檔]
+"""
+
+import cProfile
+import pstats
+import sys
+
+from auto import OptimizedMapleBot, setup_logging
+
+def profile_detection(bot: OptimizedMapleBot, frames: int) -> cProfile.Profile:
+    """連續擷取並偵測指定幀數，回傳分析結果"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for _ in range(frames):
+        img = bot.capture_screen()
+        if img is not None:
+            bot.detect_objects(img)
+    profiler.disable()
+    return profiler
+
+def main():
+    """主函數"""
+    setup_logging()
+    print("🍁 MapleStory Worlds 偵測效能分析")
+    print("=" * 50)
+    
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    output_path = sys.argv[2] if len(sys.argv) > 2 else "detection.prof"
+    
+    bot = OptimizedMapleBot()
+    if bot.model is None:
+        print("❌ 模型未載入")
+        return False
+    
+    try:
+        print(f"🔄 分析 {frames} 幀的擷取與偵測...")
+        profiler = profile_detection(bot, frames)
+    finally:
+        bot.close()
+    
+    stats = pstats.Stats(profiler).sort_stats('cumulative')
+    stats.dump_stats(output_path)
+    stats.print_stats(25)
+    print(f"✅ 分析結果已保存: {output_path}")
+    print(f"   檢視: python -m pstats {output_path}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MapleStory Worlds 模型量化工具
+將 YOLO 模型轉為 INT8 量化的 ONNX 模型，供 CPU 上的 ONNX Runtime 推論使用
+用法: python tools/quantize.py [模型路徑] [校準截圖目錄]
+提供遊戲截圖目錄時以靜態量化 (QDQ) 校準，否則退回動態量化
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+# 優先使用 libyaml 的 C 版載入器
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# 校準最多使用的截圖數量
+MAX_CALIBRATION_IMAGES = 100
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+def load_imgsz(config_path: str = "config.yaml") -> int:
+    """讀取 config.yaml 的 model.imgsz，與 auto.py 推論時的輸入尺寸一致"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.load(f, Loader=YamlLoader) or {}
+        return int((config.get('model') or {}).get('imgsz', 640))
+    except (OSError, yaml.YAMLError, TypeError, ValueError):
+        return 640
+
+def export_onnx(model_path: Path, imgsz: int) -> Path:
+    """將 .pt 模型匯出為 ONNX"""
+    from ultralytics import YOLO
+    
+    print(f"🔄 匯出 ONNX: {model_path} (輸入尺寸 {imgsz})")
+    exported = YOLO(str(model_path)).export(format='onnx', imgsz=imgsz, simplify=True)
+    return Path(exported)
+
+def preprocess(img, imgsz: int):
+    """與 ultralytics 相同的 letterbox 前處理: 等比縮放、灰色補邊、BGR→RGB、NCHW float32"""
+    import cv2
+    import numpy as np
+    
+    height, width = img.shape[:2]
+    scale = imgsz / max(height, width)
+    resized = cv2.resize(img, (round(width * scale), round(height * scale)),
+                         interpolation=cv2.INTER_AREA)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top = (imgsz - resized.shape[0]) // 2
+    left = (imgsz - resized.shape[1]) // 2
+    canvas[top:top + resized.shape[0], left:left + resized.shape[1]] = resized
+    blob = canvas[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+    return np.ascontiguousarray(blob)
+
+def create_calibration_reader(onnx_path: Path, image_dir: Path, imgsz: int):
+    """建立逐張讀取遊戲截圖的校準資料讀取器"""
+    import cv2
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationDataReader
+    
+    session = ort.InferenceSession(str(onnx_path), providers=['CPUExecutionProvider'])
+    input_name = session.get_inputs()[0].name
+    images = sorted(p for p in image_dir.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+    images = images[:MAX_CALIBRATION_IMAGES]
+    if not images:
+        raise ValueError(f"校準目錄中沒有截圖: {image_dir}")
+    print(f"📷 使用 {len(images)} 張截圖進行校準")
+    
+    class FrameCalibrationReader(CalibrationDataReader):
+        def __init__(self):
+            self._paths = iter(images)
+        
+        def get_next(self):
+            for path in self._paths:
+                img = cv2.imread(str(path))
+                if img is not None:
+                    return {input_name: preprocess(img, imgsz)}
+            return None
+    
+    return FrameCalibrationReader()
+
+def quantize_model(onnx_path: Path, image_dir: Optional[Path] = None, imgsz: int = 640) -> Path:
+    """以 ONNX Runtime 進行 INT8 量化 (有校準截圖時用靜態 QDQ，否則動態量化)"""
+    from onnxruntime.quantization import (QuantFormat, QuantType, quantize_dynamic,
+                                          quantize_static)
+    
+    output_path = onnx_path.with_name(f"{onnx_path.stem}.int8.onnx")
+    print(f"🔄 量化模型: {onnx_path} → {output_path}")
+    if image_dir is not None:
+        # ONNX Runtime 建議 CNN 使用靜態量化: QDQ 格式、uint8 激活值、int8 權重
+        quantize_static(str(onnx_path), str(output_path),
+                        create_calibration_reader(onnx_path, image_dir, imgsz),
+                        quant_format=QuantFormat.QDQ,
+                        activation_type=QuantType.QUInt8,
+                        weight_type=QuantType.QInt8)
+    else:
+        # 卷積層動態量化會產生 ConvInteger，CPU 執行器只支援 uint8 權重
+        print("⚠️ 未提供校準截圖目錄，改用動態量化 (精度與速度不如靜態量化)")
+        quantize_dynamic(str(onnx_path), str(output_path), weight_type=QuantType.QUInt8)
+    return output_path
+
+def main():
+    """主函數"""
+    print("🍁 MapleStory Worlds 模型量化工具")
+    print("=" * 50)
+    
+    model_path = Path(sys.argv[1] if len(sys.argv) > 1 else "weights/best.pt")
+    if not model_path.exists():
+        print(f"❌ 模型文件不存在: {model_path}")
+        return False
+    
+    image_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    if image_dir is not None and not image_dir.is_dir():
+        print(f"❌ 校準截圖目錄不存在: {image_dir}")
+        return False
+    
+    imgsz = load_imgsz()
+    try:
+        onnx_path = model_path if model_path.suffix == '.onnx' else export_onnx(model_path, imgsz)
+        output_path = quantize_model(onnx_path, image_dir, imgsz)
+    except ImportError as e:
+        print(f"❌ 缺少依賴: {e}")
+        print("   pip install onnx onnxruntime")
+        return False
+    except Exception as e:
+        print(f"❌ 量化失敗: {e}")
+        return False
+    
+    size_before = onnx_path.stat().st_size / (1024 * 1024)
+    size_after = output_path.stat().st_size / (1024 * 1024)
+    print(f"✅ 量化完成: {output_path}")
+    print(f"   大小: {size_before:.1f} MB → {size_after:.1f} MB")
+    print("\n🚀 在 auto.py 的模型選單中選擇此文件即可使用")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -19,11 +19,28 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+_config = None
+_bot = None
+
+def _shared_config() -> ConfigManager:
+    """所有測試共用同一份配置，只解析一次 YAML"""
+    global _config
+    if _config is None:
+        _config = ConfigManager()
+    return _config
+
+def _shared_bot() -> OptimizedMapleBot:
+    """所有測試共用同一個機器人實例，避免重複解析配置與載入模型"""
+    global _bot
+    if _bot is None:
+        _bot = OptimizedMapleBot(config_manager=_shared_config())
+    return _bot
+
 def test_mob_hunting_config():
     """測試尋找怪物配置"""
     print("🧪 測試尋找怪物配置...")
     
-    config = ConfigManager()
+    config = _shared_config()
     
     # 檢查配置項目
     mob_hunting_config = config.get('automation.mob_hunting')
@@ -59,18 +76,18 @@ def test_mob_hunting_logic():
     print("\n🧪 測試尋找怪物邏輯...")
     
     try:
-        bot = OptimizedMapleBot()
+        bot = _shared_bot()
         
         # 測試搜尋條件檢查
         print("測試搜尋條件檢查...")
         
         # 模擬沒有偵測到怪物的情況
-        bot.last_mob_detection_time = time.time() - 5  # 5秒前
+        bot.last_mob_detection_time = time.perf_counter() - 5  # 5秒前
         should_search = bot._should_search_for_mobs()
         print(f"   5秒未偵測到怪物，應該搜尋: {should_search}")
         
         # 模擬剛偵測到怪物的情況
-        bot.last_mob_detection_time = time.time()
+        bot.last_mob_detection_time = time.perf_counter()
         should_search = bot._should_search_for_mobs()
         print(f"   剛偵測到怪物，應該搜尋: {should_search}")
         
@@ -96,7 +113,7 @@ def test_search_patterns():
     print("\n🧪 測試搜尋模式...")
     
     try:
-        bot = OptimizedMapleBot()
+        bot = _shared_bot()
         
         # 測試水平搜尋
         print("測試水平搜尋模式...")